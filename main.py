@@ -1,11 +1,23 @@
 # main.py
-import json
+import asyncio
 import logging
-from typing import Dict, List, Optional
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
 from dataclasses import dataclass
 from pathlib import Path
 
+import ijson
+import orjson
+from ijson.common import ObjectBuilder
+
 from models.llm_handler import LLMHandler
+from models.structure_cache import StructureCache
+from templates.prompts import (
+    EDUCATIONAL_VIDEO_STATIC_PROMPT,
+    EDUCATIONAL_VIDEO_REQUEST_TEMPLATE,
+    FORMAT_INSTRUCTIONS,
+)
 from models.tts_handler import TTSHandler
 from video_generation.scene_renderer import SceneRenderer
 from video_generation.audio_processor import AudioProcessor
@@ -14,6 +26,27 @@ from utils.config import Config
 from utils.progress_tracker import ProgressTracker
 
 
+# Static per-format specifications; hoisted so lookups don't rebuild the
+# dict on every prompt build.
+_FORMAT_SPECS = {
+    "short": {
+        "duration": "30-60 seconds",
+        "duration_specs": "Quick concept introduction",
+        "aspect_ratio": "9:16 (Portrait)",
+    },
+    "medium": {
+        "duration": "10-15 minutes",
+        "duration_specs": "Comprehensive explanation",
+        "aspect_ratio": "16:9 (Landscape)",
+    },
+    "long": {
+        "duration": "30-40 minutes",
+        "duration_specs": "Deep dive exploration",
+        "aspect_ratio": "16:9 (Landscape)",
+    },
+}
+
+
 @dataclass
 class VideoRequest:
     """Video generation request parameters"""
@@ -36,6 +69,21 @@ class EducationalVideoPipeline:
         self.audio_processor = AudioProcessor(config.audio_config)
         self.video_composer = VideoComposer(config.video_config)
         self.progress_tracker = ProgressTracker()
+        self.structure_cache = StructureCache(
+            config.llm_config.get("cache_dir", "structure_cache")
+        )
+        self._max_parallel_renders = int(config.manim_config.get("max_parallel", 2))
+
+        # The static prompt prefix only varies by format; assemble each
+        # variant once instead of re-concatenating ~3 KB per call.
+        self._static_prompt_blocks = {
+            video_format: (
+                EDUCATIONAL_VIDEO_STATIC_PROMPT
+                + "\n## VIDEO FORMAT SPECIFICATIONS\n"
+                + instructions
+            )
+            for video_format, instructions in FORMAT_INSTRUCTIONS.items()
+        }
 
         # Setup logging
         logging.basicConfig(
@@ -57,89 +105,313 @@ class EducationalVideoPipeline:
         self.progress_tracker.start(f"Generating video: {request.concept}")
 
         try:
-            # Step 1: Generate content structure
-            self.logger.info("Generating video structure and content...")
-            video_structure = self._generate_video_structure(request)
-            self.progress_tracker.update(20, "Content structure generated")
-
-            # Step 2: Render individual scenes
-            self.logger.info("Rendering Manim scenes...")
-            scene_videos = self._render_scenes(video_structure)
-            self.progress_tracker.update(50, "Scenes rendered")
-
-            # Step 3: Generate and process audio
-            self.logger.info("Generating voice-over audio...")
-            audio_files = self._generate_audio(video_structure)
-            self.progress_tracker.update(70, "Audio generated")
-
-            # Step 4: Compose final video
-            self.logger.info("Composing final video...")
-            final_video = self._compose_video(
-                scene_videos, audio_files, video_structure
-            )
+            final_video = asyncio.run(self._generate_video_async(request))
             self.progress_tracker.update(100, "Video generation complete")
-
             return final_video
 
         except Exception as e:
             self.logger.error(f"Video generation failed: {str(e)}")
             raise
 
-    def _generate_video_structure(self, request: VideoRequest) -> Dict:
-        """Generate video structure using LLM"""
-        prompt = self._build_master_prompt(request)
-        response = self.llm_handler.generate(prompt, request.llm_params)
-
-        # Parse and validate response
-        try:
-            structure = json.loads(response)
-            self._validate_structure(structure)
-            return structure
-        except json.JSONDecodeError:
-            raise ValueError("Invalid JSON response from LLM")
+    def generate_videos(self, requests: List[VideoRequest]) -> List[Path]:
+        """
+        Generate several videos, batching the LLM structure calls.
 
-    def _render_scenes(self, structure: Dict) -> List[Path]:
-        """Render individual Manim scenes"""
-        scene_videos = []
+        Prompts for every cache-miss request are built up front and
+        submitted in a single generate_batch call, so a vLLM backend can
+        schedule them together with continuous batching instead of
+        prefilling one prompt at a time.
+        """
+        structures: List[Optional[Dict]] = [
+            self.structure_cache.lookup(
+                request.video_format, request.audience_level, request.concept
+            )
+            for request in requests
+        ]
+
+        misses = [i for i, structure in enumerate(structures) if structure is None]
+        if misses:
+            prompts = [self._build_master_prompt(requests[i]) for i in misses]
+            params = [requests[i].llm_params for i in misses]
+
+            self.logger.info(f"Generating {len(misses)} video structures...")
+            responses = self.llm_handler.generate_batch(prompts, params)
+
+            for i, response in zip(misses, responses):
+                # Complete responses skip the incremental parser; orjson
+                # decodes the full JSON in one Rust-side pass.
+                try:
+                    structure = orjson.loads(response)
+                except orjson.JSONDecodeError:
+                    raise ValueError("Invalid JSON response from LLM")
+                self._validate_structure(structure)
+                self.structure_cache.store(
+                    requests[i].video_format,
+                    requests[i].audience_level,
+                    requests[i].concept,
+                    structure,
+                )
+                structures[i] = structure
+
+        videos = []
+        for request, structure in zip(requests, structures):
+            self.progress_tracker.start(f"Generating video: {request.concept}")
+            videos.append(asyncio.run(self._generate_video_async(request, structure)))
+            self.progress_tracker.update(100, "Video generation complete")
 
-        for scene in structure["scenes"]:
-            self.logger.info(f"Rendering scene: {scene['scene_name']}")
+        return videos
 
-            # Create temporary scene file
-            scene_file = self._create_scene_file(scene)
+    async def _generate_video_async(
+        self, request: VideoRequest, structure: Optional[Dict] = None
+    ) -> Path:
+        """Run the four stages as overlapping pipeline workers.
 
-            # Render with Manim
-            video_path = self.scene_renderer.render_scene(
-                scene_file, scene["scene_name"], structure["rendering_instructions"]
+        Rendering (CPU subprocesses), TTS (GPU), and composition (ffmpeg)
+        use disjoint resources, so each stage runs as a worker pulling from
+        its own queue. Scenes are admitted to rendering and TTS as they are
+        parsed out of the LLM stream, so the first scenes render while the
+        last ones are still being generated.
+        """
+        loop = asyncio.get_running_loop()
+
+        render_q: asyncio.Queue = asyncio.Queue()
+        tts_q: asyncio.Queue = asyncio.Queue()
+
+        # Per-scene futures let the compose stage await exactly the inputs
+        # it needs, in scene order, as they finish.
+        scene_videos: Dict[int, asyncio.Future] = {}
+        audio_files: Dict[int, asyncio.Future] = {}
+        instructions_future: asyncio.Future = loop.create_future()
+
+        def _admit_scene(scene: Dict) -> None:
+            number = scene["scene_number"]
+            if number in scene_videos:
+                return
+            scene_videos[number] = loop.create_future()
+            audio_files[number] = loop.create_future()
+            # Scenes are independent across stages; feed both queues at once.
+            render_q.put_nowait(scene)
+            tts_q.put_nowait(scene)
+
+        def _set_instructions(instructions: Dict) -> None:
+            if not instructions_future.done():
+                instructions_future.set_result(instructions)
+
+        n_render_workers = max(1, min(os.cpu_count() // 2, self._max_parallel_renders))
+
+        with ProcessPoolExecutor(max_workers=n_render_workers) as pool:
+            workers = [
+                asyncio.create_task(
+                    self._render_worker(
+                        render_q, scene_videos, instructions_future, pool
+                    )
+                )
+                for _ in range(n_render_workers)
+            ]
+            workers.append(asyncio.create_task(self._tts_worker(tts_q, audio_files)))
+            compose_task = None
+
+            try:
+                if structure is None:
+                    # The structure streams in on a worker thread; callbacks
+                    # hop back onto the event loop to feed the stage queues.
+                    self.logger.info("Generating video structure and content...")
+                    structure = await asyncio.to_thread(
+                        self._generate_video_structure,
+                        request,
+                        lambda scene: loop.call_soon_threadsafe(_admit_scene, scene),
+                        lambda instr: loop.call_soon_threadsafe(
+                            _set_instructions, instr
+                        ),
+                    )
+                self.progress_tracker.update(20, "Content structure generated")
+
+                scenes = sorted(structure["scenes"], key=lambda s: s["scene_number"])
+
+                # Admit anything the streaming parser did not dispatch and
+                # close the queues.
+                for scene in scenes:
+                    _admit_scene(scene)
+                _set_instructions(structure["rendering_instructions"])
+                for _ in range(n_render_workers):
+                    render_q.put_nowait(None)
+                tts_q.put_nowait(None)
+
+                compose_task = asyncio.create_task(
+                    self._compose_worker(scenes, scene_videos, audio_files, structure)
+                )
+
+                await asyncio.gather(*workers)
+                self.progress_tracker.update(70, "Scenes rendered, audio generated")
+                return await compose_task
+            finally:
+                for task in workers:
+                    task.cancel()
+                if compose_task is not None:
+                    compose_task.cancel()
+
+    async def _render_worker(
+        self,
+        render_q: asyncio.Queue,
+        scene_videos: Dict[int, asyncio.Future],
+        instructions_future: asyncio.Future,
+        pool: ProcessPoolExecutor,
+    ) -> None:
+        """Pull scenes from the render queue and render them in the pool"""
+        loop = asyncio.get_running_loop()
+
+        while (scene := await render_q.get()) is not None:
+            # Rendering instructions stream in ahead of the scenes.
+            instructions = await asyncio.shield(instructions_future)
+
+            video_path = await loop.run_in_executor(
+                pool,
+                self.scene_renderer.render_scene,
+                self._build_scene_source(scene),
+                scene["scene_name"],
+                instructions,
             )
 
-            scene_videos.append(video_path)
-
-            # Cleanup temporary file
-            scene_file.unlink()
-
-        return scene_videos
+            self.logger.info(f"Rendered scene: {scene['scene_name']}")
+            scene_videos[scene["scene_number"]].set_result(video_path)
+
+    async def _tts_worker(
+        self, tts_q: asyncio.Queue, audio_files: Dict[int, asyncio.Future]
+    ) -> None:
+        """Drain the TTS queue in greedy batches and synthesize voice-overs"""
+        while (scene := await tts_q.get()) is not None:
+            # Batch whatever scenes are already queued so XTTS amortizes
+            # per-call overhead without waiting for late arrivals.
+            batch = [scene]
+            while not tts_q.empty():
+                nxt = tts_q.get_nowait()
+                if nxt is None:
+                    tts_q.put_nowait(None)
+                    break
+                batch.append(nxt)
+
+            texts = [s["voice_over"] for s in batch]
+            paths = [Path(f"audio_{s['scene_number']}.wav") for s in batch]
+
+            self.logger.info(f"Generating audio for {len(batch)} scenes")
+            raw_paths = await asyncio.to_thread(
+                self.tts_handler.generate_speech_batch, texts, paths
+            )
 
-    def _generate_audio(self, structure: Dict) -> List[Path]:
-        """Generate TTS audio for each scene"""
-        audio_files = []
+            for s, raw_path in zip(batch, raw_paths):
+                processed = await asyncio.to_thread(
+                    self.audio_processor.process_audio,
+                    raw_path,
+                    s["duration_seconds"],
+                )
+                audio_files[s["scene_number"]].set_result(processed)
+
+    async def _compose_worker(
+        self,
+        scenes: List[Dict],
+        scene_videos: Dict[int, asyncio.Future],
+        audio_files: Dict[int, asyncio.Future],
+        structure: Dict,
+    ) -> Path:
+        """Await per-scene outputs in order and compose the final video"""
+        videos = [await scene_videos[s["scene_number"]] for s in scenes]
+        audios = [await audio_files[s["scene_number"]] for s in scenes]
+
+        self.logger.info("Composing final video...")
+        return await asyncio.to_thread(self._compose_video, videos, audios, structure)
+
+    def _generate_video_structure(
+        self,
+        request: VideoRequest,
+        on_scene: Optional[Callable[[Dict], None]] = None,
+        on_instructions: Optional[Callable[[Dict], None]] = None,
+    ) -> Dict:
+        """Generate video structure using the streaming LLM interface.
+
+        Scene dicts and rendering instructions are handed to the callbacks
+        the moment their closing brace arrives, so downstream stages start
+        before the LLM finishes. Near-duplicate requests are served from
+        the semantic structure cache without touching the LLM.
+        """
+        cached = self.structure_cache.lookup(
+            request.video_format, request.audience_level, request.concept
+        )
+        if cached is not None:
+            self._validate_structure(cached)
+            self._dispatch_structure(cached, on_scene, on_instructions)
+            return cached
 
-        for scene in structure["scenes"]:
-            self.logger.info(f"Generating audio for: {scene['scene_name']}")
+        prompt = self._build_master_prompt(request)
+        chunks = self.llm_handler.generate_stream(prompt, request.llm_params)
 
-            audio_path = self.tts_handler.generate_speech(
-                text=scene["voice_over"],
-                output_path=f"audio_{scene['scene_number']}.wav",
-            )
+        structure = self._parse_structure_stream(chunks, on_scene, on_instructions)
+        self._validate_structure(structure)
 
-            # Process audio for timing
-            processed_audio = self.audio_processor.process_audio(
-                audio_path, target_duration=scene["duration_seconds"]
-            )
+        self.structure_cache.store(
+            request.video_format, request.audience_level, request.concept, structure
+        )
+        return structure
+
+    @staticmethod
+    def _dispatch_structure(
+        structure: Dict,
+        on_scene: Optional[Callable[[Dict], None]] = None,
+        on_instructions: Optional[Callable[[Dict], None]] = None,
+    ) -> None:
+        """Feed an already-complete structure through the streaming callbacks"""
+        if on_instructions is not None:
+            on_instructions(structure["rendering_instructions"])
+        if on_scene is not None:
+            for scene in structure["scenes"]:
+                on_scene(scene)
+
+    def _parse_structure_stream(
+        self,
+        chunks: Iterable[str],
+        on_scene: Optional[Callable[[Dict], None]] = None,
+        on_instructions: Optional[Callable[[Dict], None]] = None,
+    ) -> Dict:
+        """Incrementally parse the structure JSON from a stream of text chunks"""
+        events = ijson.sendable_list()
+        parser = ijson.parse_coro(events)
+
+        root_builder = ObjectBuilder()
+        scene_builder: Optional[ObjectBuilder] = None
+
+        def _handle(prefix: str, event: str, value) -> None:
+            nonlocal scene_builder
+            root_builder.event(event, value)
+
+            if prefix == "scenes.item" and event == "start_map":
+                scene_builder = ObjectBuilder()
+            if scene_builder is not None:
+                scene_builder.event(event, value)
+            if prefix == "scenes.item" and event == "end_map":
+                scene = scene_builder.value
+                scene_builder = None
+                if on_scene is not None:
+                    self._validate_scene(scene)
+                    on_scene(scene)
+            if (
+                prefix == "rendering_instructions"
+                and event == "end_map"
+                and on_instructions is not None
+            ):
+                on_instructions(root_builder.value["rendering_instructions"])
 
-            audio_files.append(processed_audio)
+        try:
+            for chunk in chunks:
+                parser.send(chunk.encode("utf-8"))
+                for prefix, event, value in events:
+                    _handle(prefix, event, value)
+                del events[:]
+            parser.close()
+            for prefix, event, value in events:
+                _handle(prefix, event, value)
+        except ijson.JSONError:
+            raise ValueError("Invalid JSON response from LLM")
 
-        return audio_files
+        return root_builder.value
 
     def _compose_video(
         self, scene_videos: List[Path], audio_files: List[Path], structure: Dict
@@ -152,45 +424,35 @@ class EducationalVideoPipeline:
             rendering_config=structure["rendering_instructions"],
         )
 
-    def _build_master_prompt(self, request: VideoRequest) -> str:
-        """Build the master prompt from template"""
-        from templates.prompts import (
-            EDUCATIONAL_VIDEO_MASTER_PROMPT,
-            FORMAT_INSTRUCTIONS,
-        )
+    def _build_master_prompt(self, request: VideoRequest) -> List[Dict]:
+        """Build the master prompt as cacheable blocks.
 
+        Block 0 is static for a given video format (byte-identical across
+        calls) and tagged cacheable, so providers with prompt caching — or
+        vLLM's prefix cache — only prefill the short request block.
+        """
         format_specs = self._get_format_specs(request.video_format)
 
-        return EDUCATIONAL_VIDEO_MASTER_PROMPT.format(
+        request_block = EDUCATIONAL_VIDEO_REQUEST_TEMPLATE.substitute(
             concept=request.concept,
             video_format=request.video_format,
             duration=format_specs["duration"],
             duration_specs=format_specs["duration_specs"],
             aspect_ratio=format_specs["aspect_ratio"],
             audience_level=request.audience_level,
-            format_instructions=FORMAT_INSTRUCTIONS[request.video_format],
         )
 
+        return [
+            {
+                "text": self._static_prompt_blocks[request.video_format],
+                "cache_control": {"type": "ephemeral"},
+            },
+            {"text": request_block},
+        ]
+
     def _get_format_specs(self, video_format: str) -> Dict:
         """Get format specifications"""
-        specs = {
-            "short": {
-                "duration": "30-60 seconds",
-                "duration_specs": "Quick concept introduction",
-                "aspect_ratio": "9:16 (Portrait)",
-            },
-            "medium": {
-                "duration": "10-15 minutes",
-                "duration_specs": "Comprehensive explanation",
-                "aspect_ratio": "16:9 (Landscape)",
-            },
-            "long": {
-                "duration": "30-40 minutes",
-                "duration_specs": "Deep dive exploration",
-                "aspect_ratio": "16:9 (Landscape)",
-            },
-        }
-        return specs[video_format]
+        return _FORMAT_SPECS[video_format]
 
     def _validate_structure(self, structure: Dict) -> None:
         """Validate generated video structure"""
@@ -202,14 +464,19 @@ class EducationalVideoPipeline:
 
         # Validate each scene
         for scene in structure["scenes"]:
-            scene_keys = ["scene_number", "scene_name", "voice_over", "manim_code"]
-            for key in scene_keys:
-                if key not in scene:
-                    raise ValueError(f"Missing scene key: {key}")
-
-    def _create_scene_file(self, scene: Dict) -> Path:
-        """Create temporary Python file for scene"""
-        scene_code = f"""
+            self._validate_scene(scene)
+
+    @staticmethod
+    def _validate_scene(scene: Dict) -> None:
+        """Validate a single scene dict"""
+        scene_keys = ["scene_number", "scene_name", "voice_over", "manim_code"]
+        for key in scene_keys:
+            if key not in scene:
+                raise ValueError(f"Missing scene key: {key}")
+
+    def _build_scene_source(self, scene: Dict) -> str:
+        """Build the Python source for a scene's Manim class"""
+        return f"""
 from manim import *
 
 class {scene['scene_name']}(Scene):
@@ -217,10 +484,6 @@ class {scene['scene_name']}(Scene):
 {scene['manim_code']}
 """
 
-        file_path = Path(f"temp_{scene['scene_name']}.py")
-        file_path.write_text(scene_code)
-        return file_path
-
 
 # Usage example
 if __name__ == "__main__":
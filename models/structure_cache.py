@@ -0,0 +1,134 @@
+# models/structure_cache.py
+import copy
+import logging
+
+import orjson
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import faiss
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # semantic caching is optional
+    faiss = None
+    np = None
+    SentenceTransformer = None
+
+
+class StructureCache:
+    """Semantic cache for generated video structures.
+
+    Structures are bucketed by (video_format, audience_level); within a
+    bucket, concepts are embedded with MiniLM and searched in a
+    faiss.IndexFlatIP. A near-duplicate concept short-circuits the LLM
+    call entirely and returns the cached structure with the new concept
+    substituted into the title and voice-overs.
+    """
+
+    EMBED_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+    def __init__(self, cache_dir: str, similarity_threshold: float = 0.92):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.enabled = faiss is not None and SentenceTransformer is not None
+        if not self.enabled:
+            self.logger.info(
+                "faiss/sentence-transformers not installed; structure cache disabled"
+            )
+            return
+
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.similarity_threshold = similarity_threshold
+        self.embedder = SentenceTransformer(self.EMBED_MODEL)
+
+        # Per-bucket faiss index plus parallel list of cached entries,
+        # loaded lazily from disk.
+        self._indexes: Dict[str, "faiss.IndexFlatIP"] = {}
+        self._entries: Dict[str, List[Dict]] = {}
+
+    # ------------------------------------------------------------------ #
+    def lookup(
+        self, video_format: str, audience_level: str, concept: str
+    ) -> Optional[Dict]:
+        """Return a cached structure for a similar concept, or None"""
+        if not self.enabled:
+            return None
+
+        bucket = self._bucket_key(video_format, audience_level)
+        index = self._load_bucket(bucket)
+        if index is None or index.ntotal == 0:
+            return None
+
+        scores, ids = index.search(self._embed(concept), 1)
+        if scores[0][0] < self.similarity_threshold:
+            return None
+
+        entry = self._entries[bucket][int(ids[0][0])]
+        self.logger.info(
+            f"Structure cache hit ({scores[0][0]:.3f}) for concept: {concept}"
+        )
+        return self._substitute_concept(entry["structure"], entry["concept"], concept)
+
+    # ------------------------------------------------------------------ #
+    def store(
+        self, video_format: str, audience_level: str, concept: str, structure: Dict
+    ) -> None:
+        """Add a generated structure to the cache and persist the bucket"""
+        if not self.enabled:
+            return
+
+        bucket = self._bucket_key(video_format, audience_level)
+        index = self._load_bucket(bucket)
+        if index is None:
+            index = faiss.IndexFlatIP(self.embedder.get_sentence_embedding_dimension())
+            self._indexes[bucket] = index
+            self._entries[bucket] = []
+
+        index.add(self._embed(concept))
+        self._entries[bucket].append({"concept": concept, "structure": structure})
+
+        faiss.write_index(index, str(self.cache_dir / f"{bucket}.index"))
+        (self.cache_dir / f"{bucket}.json").write_bytes(
+            orjson.dumps(self._entries[bucket])
+        )
+
+    # ------------------------------------------------------------------ #
+    def _embed(self, concept: str) -> "np.ndarray":
+        """Embed a concept, normalized so inner product equals cosine"""
+        embedding = self.embedder.encode([concept], convert_to_numpy=True)
+        faiss.normalize_L2(embedding)
+        return embedding
+
+    # ------------------------------------------------------------------ #
+    def _load_bucket(self, bucket: str) -> Optional["faiss.IndexFlatIP"]:
+        """Fetch a bucket's index, reading it from disk on first use"""
+        if bucket in self._indexes:
+            return self._indexes[bucket]
+
+        index_path = self.cache_dir / f"{bucket}.index"
+        entries_path = self.cache_dir / f"{bucket}.json"
+        if not index_path.exists() or not entries_path.exists():
+            return None
+
+        self._indexes[bucket] = faiss.read_index(str(index_path))
+        self._entries[bucket] = orjson.loads(entries_path.read_bytes())
+        return self._indexes[bucket]
+
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def _bucket_key(video_format: str, audience_level: str) -> str:
+        return f"{video_format}_{audience_level}".replace(" ", "_")
+
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def _substitute_concept(structure: Dict, old: str, new: str) -> Dict:
+        """Copy a cached structure, swapping the cached concept for the new one"""
+        structure = copy.deepcopy(structure)
+        metadata = structure.get("video_metadata", {})
+        if isinstance(metadata.get("title"), str):
+            metadata["title"] = metadata["title"].replace(old, new)
+        for scene in structure.get("scenes", []):
+            if isinstance(scene.get("voice_over"), str):
+                scene["voice_over"] = scene["voice_over"].replace(old, new)
+        return structure
@@ -1,12 +1,13 @@
-EDUCATIONAL_VIDEO_MASTER_PROMPT = """
-You are an expert educational video creator specializing in scientific concept explanation through visual programming with Manim. Your task is to generate Python code using the Manim library and corresponding voice-over scripts that create engaging, pedagogically sound educational videos.
+import string
 
-## CONTEXT & CONSTRAINTS
-- Target Platform: {video_format} format video
-- Duration: {duration} ({duration_specs})
-- Aspect Ratio: {aspect_ratio}
-- Concept: {concept}
-- Audience Level: {audience_level}
+# The master prompt is split into a large static block and a small
+# per-request block. The static block contains no substitution slots, so
+# it is byte-identical across calls and can be served from a provider's
+# prompt cache (or vLLM's prefix cache); only the short request block
+# changes between videos.
+
+EDUCATIONAL_VIDEO_STATIC_PROMPT = """
+You are an expert educational video creator specializing in scientific concept explanation through visual programming with Manim. Your task is to generate Python code using the Manim library and corresponding voice-over scripts that create engaging, pedagogically sound educational videos.
 
 ## VISUAL LEARNING PRINCIPLES
 Apply these cognitive science principles:
@@ -17,9 +18,6 @@ Apply these cognitive science principles:
 5. **Chunking**: Group related elements together
 6. **Spaced Repetition**: Reinforce key concepts throughout the video
 
-## VIDEO FORMAT SPECIFICATIONS
-{format_instructions}
-
 ## EDUCATIONAL METHODOLOGY
 ### For Short Format (30-60 seconds):
 - **Hook**: Start with intriguing question or visual
@@ -50,7 +48,9 @@ Generate clean, efficient Python code that:
 5. **Performance**: Optimize for T4 GPU rendering efficiency
 
 ## OUTPUT STRUCTURE
-Provide your response in this exact JSON format:
+Provide your response in this exact JSON format. Emit the keys in exactly
+this order ("scenes" last), so downstream processing can begin before the
+full response is complete:
 {
 "video_metadata": {
 "title": "Clear, descriptive title",
@@ -58,16 +58,6 @@ Provide your response in this exact JSON format:
 "scene_count": number_of_scenes,
 "key_concepts": ["concept1", "concept2", "concept3"]
 },
-"scenes": [
-{
-"scene_number": 1,
-"scene_name": "descriptive_scene_name",
-"duration_seconds": scene_duration,
-"voice_over": "Complete script for this scene with natural pacing and clear explanations",
-"manim_code": "Complete Python code for this scene using Manim library",
-"timing_notes": "Specific timing synchronization notes for voice-over alignment"
-}
-],
 "rendering_instructions": {
 "resolution": "resolution_string",
 "frame_rate": 30,
@@ -77,7 +67,17 @@ Provide your response in this exact JSON format:
 "color_palette": ["#color1", "#color2", "#color3"],
 "font_sizes": {"title": 48, "subtitle": 36, "body": 24},
 "animation_style": "smooth_professional"
+},
+"scenes": [
+{
+"scene_number": 1,
+"scene_name": "descriptive_scene_name",
+"duration_seconds": scene_duration,
+"voice_over": "Complete script for this scene with natural pacing and clear explanations",
+"manim_code": "Complete Python code for this scene using Manim library",
+"timing_notes": "Specific timing synchronization notes for voice-over alignment"
 }
+]
 }
 
 
@@ -93,9 +93,23 @@ Consider these proven approaches:
 - **Clarity**: Every visual element should serve a clear pedagogical purpose
 - **Engagement**: Maintain viewer interest through varied visual techniques
 - **Accessibility**: Consider diverse learning styles and abilities
+"""
+
+# Per-request block appended after the static prompt; this is the only
+# part that varies between calls. Precompiled as a string.Template so
+# batch runs pay the parse cost once at import.
+EDUCATIONAL_VIDEO_REQUEST_TEMPLATE = string.Template(
+    """
+## CONTEXT & CONSTRAINTS
+- Target Platform: $video_format format video
+- Duration: $duration ($duration_specs)
+- Aspect Ratio: $aspect_ratio
+- Concept: $concept
+- Audience Level: $audience_level
 
-Now, create an educational video about: {concept}
+Now, create an educational video about: $concept
 """
+)
 
 # Format-specific instructions
 FORMAT_INSTRUCTIONS = {
@@ -12,8 +12,12 @@ class ProgressTracker:
     Lightweight wrapper around tqdm for CLI progress indication.
     """
 
+    #: Minimum seconds between terminal reprints.
+    REFRESH_INTERVAL = 0.1
+
     def __init__(self) -> None:
         self._bar: Optional[tqdm] = None
+        self._last_refresh = 0.0
         self.logger = logging.getLogger(self.__class__.__name__)
 
     # ------------------------------------------------------------------ #
@@ -23,6 +27,7 @@ class ProgressTracker:
             self._bar.close()
         self._bar = tqdm(total=100, desc=description, ncols=100)
         self._bar.update(0)
+        self._last_refresh = time.monotonic()
 
     # ------------------------------------------------------------------ #
     def update(self, percent: float, note: str = "") -> None:
@@ -33,6 +38,14 @@ class ProgressTracker:
             self.start("Working")
         percent = min(max(percent, 0), 100)
         self._bar.n = percent
+
+        # Manual refresh() bypasses tqdm's mininterval, so rate-limit it
+        # here; otherwise tight inner loops spend their time on terminal
+        # I/O. Completion always repaints.
+        now = time.monotonic()
+        if percent < 100 and now - self._last_refresh < self.REFRESH_INTERVAL:
+            return
+        self._last_refresh = now
         self._bar.set_postfix_str(note)
         self._bar.refresh()
 
@@ -5,10 +5,19 @@ import subprocess
 from pathlib import Path
 from typing import Optional
 
+try:
+    import av
+except ImportError:  # PyAV is optional; fall back to ffmpeg/ffprobe
+    av = None
+
 
 class AudioProcessor:
     """
     Adjust TTS audio to match target scene duration using FFmpeg filters.
+
+    When PyAV is installed, probing and filtering run in-process through
+    libavformat/libavfilter, avoiding a fork/exec pair per scene; the
+    subprocess path remains as fallback (and for rubberband pitch shift).
     """
 
     def __init__(self, audio_config: dict | None = None) -> None:
@@ -35,11 +44,14 @@ class AudioProcessor:
         # FFmpeg atempo supports 0.5–2.0; chain filters for large factors.
         current_duration = self._probe_duration(wav_path)
         speed_factor = current_duration / target_duration
-        filters: list[str] = []
-
-        # Chain atempo filters to approximate desired speed.
         factors = self._split_speed_factor(speed_factor)
-        filters.extend([f"atempo={f:.3f}" for f in factors])
+
+        # rubberband is only reachable through the ffmpeg CLI build.
+        if av is not None and not pitch_shift:
+            self._filter_in_process(wav_path, processed_path, factors)
+            return processed_path
+
+        filters = [f"atempo={f:.3f}" for f in factors]
 
         if pitch_shift:
             # Example pitch shift filter using rubberband (if compiled).
@@ -64,6 +76,58 @@ class AudioProcessor:
         subprocess.run(cmd, capture_output=True, check=True)
         return processed_path
 
+    # ------------------------------------------------------------------ #
+    def _filter_in_process(
+        self, wav_path: Path, processed_path: Path, factors: list[float]
+    ) -> None:
+        """
+        Run the atempo chain through libavfilter without spawning ffmpeg.
+        """
+        layout = "stereo" if self.channels == 2 else "mono"
+
+        in_container = av.open(str(wav_path))
+        in_stream = in_container.streams.audio[0]
+
+        out_container = av.open(str(processed_path), "w")
+        out_stream = out_container.add_stream("pcm_s16le", rate=self.sample_rate)
+
+        graph = av.filter.Graph()
+        node = graph.add_abuffer(template=in_stream)
+        for factor in factors:
+            atempo = graph.add("atempo", f"{factor:.3f}")
+            node.link_to(atempo)
+            node = atempo
+        aformat = graph.add(
+            "aformat",
+            f"sample_fmts=s16:sample_rates={self.sample_rate}"
+            f":channel_layouts={layout}",
+        )
+        node.link_to(aformat)
+        sink = graph.add("abuffersink")
+        aformat.link_to(sink)
+        graph.configure()
+
+        def _drain() -> None:
+            while True:
+                try:
+                    filtered = graph.pull()
+                except (BlockingIOError, EOFError):
+                    return
+                filtered.pts = None
+                for packet in out_stream.encode(filtered):
+                    out_container.mux(packet)
+
+        for frame in in_container.decode(in_stream):
+            graph.push(frame)
+            _drain()
+        graph.push(None)  # flush the filter chain
+        _drain()
+
+        for packet in out_stream.encode(None):
+            out_container.mux(packet)
+        out_container.close()
+        in_container.close()
+
     # ------------------------------------------------------------------ #
     @staticmethod
     def _split_speed_factor(speed: float) -> list[float]:
@@ -83,8 +147,12 @@ class AudioProcessor:
     @staticmethod
     def _probe_duration(audio_path: Path) -> float:
         """
-        Retrieve duration of audio file in seconds via ffprobe.
+        Retrieve duration of audio file in seconds, in-process when possible.
         """
+        if av is not None:
+            with av.open(str(audio_path)) as container:
+                return float(container.duration) / av.time_base
+
         cmd = [
             "ffprobe",
             "-v",
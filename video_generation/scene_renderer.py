@@ -1,12 +1,35 @@
 from __future__ import annotations
 
+import functools
+import shutil
 import subprocess
+import tempfile
 from pathlib import Path
+from types import CodeType
 from typing import Any, Dict
 
+import manim
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_scene(scene_code: str, scene_name: str) -> CodeType:
+    """
+    Compile scene source once per unique code string.
+
+    Batch runs sharing a format produce code-identical scenes (title
+    cards, equation reveals); repeats skip the parser entirely.
+    """
+    return compile(scene_code, f"<{scene_name}>", "exec")
+
 
 class SceneRenderer:
-    """Render individual Manim scenes to MP4 files."""
+    """
+    Render individual Manim scenes to MP4 files.
+
+    Scenes render in-process via Scene.render() instead of shelling out
+    to the manim CLI, which re-imported manim/torch/cairo (~1-2 s of
+    interpreter startup) for every scene.
+    """
 
     def __init__(self, manim_config: Dict[str, Any]) -> None:
         """
@@ -23,15 +46,21 @@ class SceneRenderer:
         self.output_dir = Path(manim_config.get("output_dir", "renders"))
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
+        # NVENC encodes MP4 at several hundred FPS on T4-class GPUs,
+        # leaving the CPU free for LLM/TTS work.
+        self.use_nvenc = (
+            bool(manim_config.get("use_nvenc", True)) and self._nvenc_available()
+        )
+
     # ------------------------------------------------------------------ #
     def render_scene(
         self,
-        scene_file: Path,
+        scene_code: str,
         scene_name: str,
         render_settings: Dict[str, Any] | None = None,
     ) -> Path:
         """
-        Compile a single Manim scene via subprocess.
+        Render a single Manim scene in-process.
 
         Returns
         -------
@@ -40,42 +69,88 @@ class SceneRenderer:
         """
         render_settings = render_settings or {}
         resolution = render_settings.get("resolution", "1920x1080")
-        height = resolution.split("x")[1]
+        width, height = (int(v) for v in resolution.split("x"))
 
-        cmd = [
-            "manim",
-            str(scene_file),
-            scene_name,
-            "--fps",
-            str(self.frame_rate),
-            "--" + self.quality,
-            "-r",
-            f"{resolution}",
-            "--format",
-            "mp4",
-            "--renderer",
-            "opengl",
-        ]
-
-        subprocess.run(cmd, check=True)
+        # A per-scene temporary media_dir makes cleanup of partial frames
+        # and the Tex cache automatic on context exit.
+        with tempfile.TemporaryDirectory(prefix=f"manim_{scene_name}_") as media_dir:
+            with manim.tempconfig(
+                {
+                    "quality": self.quality,
+                    "frame_rate": self.frame_rate,
+                    "pixel_width": width,
+                    "pixel_height": height,
+                    "media_dir": media_dir,
+                    "renderer": "opengl",
+                    "write_to_movie": True,
+                }
+            ):
+                namespace: Dict[str, Any] = {"__name__": "__scene__"}
+                exec(_compile_scene(scene_code, scene_name), namespace)
+                scene = namespace[scene_name]()
+                scene.render()
+                rendered = Path(scene.renderer.file_writer.movie_file_path)
 
-        # Locate the freshly rendered video
-        output_pattern = self.output_dir / f"{scene_name}.mp4"
-        fallback_pattern = scene_file.parent / "media" / "videos"
-        # Search inside manim's default directory if not in configured output_dir
-        if not output_pattern.exists():
-            mp4_files = list(fallback_pattern.rglob("*.mp4"))
-            if not mp4_files:
+            if not rendered.exists():
                 raise FileNotFoundError(f"No MP4 output found for scene {scene_name}.")
-            output_pattern = mp4_files[-1]
-
-        # Move to output_dir with canonical name
-        final_path = self.output_dir / f"{scene_name}.mp4"
-        final_path.write_bytes(output_pattern.read_bytes())
 
-        # Cleanup large build artifacts
-        for cache_dir in (scene_file.parent / "media").rglob("*"):
-            if cache_dir.is_dir():
-                cache_dir.unlink(missing_ok=True)
+            # Move to output_dir with canonical name
+            final_path = self.output_dir / f"{scene_name}.mp4"
+            if self.use_nvenc:
+                # The cheap GPU pass also normalizes codec settings across
+                # scenes, keeping stream-copy concat safe at composition.
+                self._encode_nvenc(rendered, final_path)
+            else:
+                try:
+                    # Same filesystem: atomic rename, no bytes moved.
+                    rendered.rename(final_path)
+                except OSError:
+                    # Cross-device: copyfile uses sendfile(2), never
+                    # staging the MP4 through the Python heap.
+                    shutil.copyfile(rendered, final_path)
 
         return final_path
+
+    # ------------------------------------------------------------------ #
+    def _encode_nvenc(self, src: Path, dst: Path) -> None:
+        """
+        Re-encode a rendered scene through the NVENC hardware encoder.
+        """
+        tmp_path = dst.with_stem(dst.stem + "_nvenc")
+        cmd = [
+            "ffmpeg",
+            "-y",
+            "-i",
+            str(src),
+            "-c:v",
+            "h264_nvenc",
+            "-preset",
+            "p1",
+            "-tune",
+            "ll",
+            "-pix_fmt",
+            "yuv420p",
+            "-r",
+            str(self.frame_rate),
+            "-an",
+            str(tmp_path),
+        ]
+        subprocess.run(cmd, capture_output=True, check=True)
+        tmp_path.replace(dst)
+
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def _nvenc_available() -> bool:
+        """
+        Check whether the local ffmpeg build ships the h264_nvenc encoder.
+        """
+        try:
+            result = subprocess.run(
+                ["ffmpeg", "-hide_banner", "-encoders"],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+        except (OSError, subprocess.CalledProcessError):
+            return False
+        return "h264_nvenc" in result.stdout
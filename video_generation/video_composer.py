@@ -30,7 +30,12 @@ class VideoComposer:
         """
         Stitch scene videos and align audio tracks into a single MP4.
 
-        Scene count and audio count must be equal.
+        Scene count and audio count must be equal. Everything happens in
+        one FFmpeg pass: the video streams go through the concat demuxer
+        with stream copy (scene renders share codec settings) while the
+        audio tracks are joined by a concat filter and encoded to AAC, so
+        no intermediate MP4/WAV is ever written. The concat list itself is
+        piped over stdin, so composition stages nothing on disk.
         """
         scene_videos = list(scene_videos)
         audio_files = list(audio_files)
@@ -39,39 +44,33 @@ class VideoComposer:
             raise ValueError("Scene and audio counts differ.")
 
         concat_list = self._generate_concat_list(scene_videos)
-        concat_file = self.output_dir / "concat.txt"
-        concat_file.write_text(concat_list)
 
-        video_no_audio = self.output_dir / "temp_no_audio.mp4"
+        final_path = self.output_dir / f"{metadata['title'].replace(' ', '_')}.mp4"
+
+        audio_pads = "".join(f"[{i + 1}:a]" for i in range(len(audio_files)))
+        audio_filter = f"{audio_pads}concat=n={len(audio_files)}:v=0:a=1[a]"
 
-        # 1. Concatenate videos (no audio)
-        cmd_concat = [
+        cmd = [
             "ffmpeg",
             "-y",
             "-f",
             "concat",
             "-safe",
             "0",
+            "-protocol_whitelist",
+            "file,pipe",
             "-i",
-            str(concat_file),
-            "-c",
-            "copy",
-            str(video_no_audio),
+            "pipe:0",
         ]
-        subprocess.run(cmd_concat, check=True)
-
-        # 2. Merge audio tracks sequentially
-        merged_audio = self._merge_audios(audio_files)
-
-        # 3. Combine concatenated video with merged audio
-        final_path = self.output_dir / f"{metadata['title'].replace(' ', '_')}.mp4"
-        cmd_mux = [
-            "ffmpeg",
-            "-y",
-            "-i",
-            str(video_no_audio),
-            "-i",
-            str(merged_audio),
+        for wav in audio_files:
+            cmd += ["-i", str(wav)]
+        cmd += [
+            "-filter_complex",
+            audio_filter,
+            "-map",
+            "0:v",
+            "-map",
+            "[a]",
             "-c:v",
             "copy",
             "-c:a",
@@ -80,12 +79,7 @@ class VideoComposer:
             "192k",
             str(final_path),
         ]
-        subprocess.run(cmd_mux, check=True)
-
-        # Cleanup temp files
-        video_no_audio.unlink(missing_ok=True)
-        merged_audio.unlink(missing_ok=True)
-        concat_file.unlink(missing_ok=True)
+        subprocess.run(cmd, input=concat_list.encode(), check=True)
 
         return final_path
 
@@ -96,29 +90,3 @@ class VideoComposer:
         Create FFmpeg concat demuxer list text.
         """
         return "\n".join(f"file '{v.resolve()}'" for v in videos)
-
-    # ------------------------------------------------------------------ #
-    def _merge_audios(self, wav_paths: List[Path]) -> Path:
-        """
-        Concatenate WAV audio sequentially using FFmpeg.
-        """
-        concat_file = self.output_dir / "audio_concat.txt"
-        concat_file.write_text("\n".join(f"file '{p.resolve()}'" for p in wav_paths))
-        merged_path = self.output_dir / "merged_audio.wav"
-
-        cmd = [
-            "ffmpeg",
-            "-y",
-            "-f",
-            "concat",
-            "-safe",
-            "0",
-            "-i",
-            str(concat_file),
-            "-c",
-            "copy",
-            str(merged_path),
-        ]
-        subprocess.run(cmd, check=True)
-        concat_file.unlink(missing_ok=True)
-        return merged_path